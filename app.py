@@ -1,16 +1,40 @@
-from flask import Flask
+from functools import lru_cache
+from flask import Flask, request, url_for
+from utils.cache import cache
 from routes.home import home_bp
 from routes.projections import projections_bp
 from routes.schedule import schedule_bp
 from routes.news import news_bp
 from routes.injuries import injuries_bp
 
+# Templates call url_for for every nav link on every render, and the result
+# for a given endpoint + values never changes while the app is running.
+# Caching the lookup keeps Jinja renders from re-running Flask's URL building.
+# The values dict isn't hashable, so the cached helper takes a sorted tuple.
+@lru_cache(maxsize=4096)
+def _build_url(endpoint, value_items):
+    return url_for(endpoint, **dict(value_items))
+
+def cached_url_for(endpoint, **values):
+    return _build_url(endpoint, tuple(sorted(values.items())))
+
 # Create the Flask application instance
 # This function initializes the Flask app and registers the blueprints for different routes.
 # Each blueprint corresponds to a specific section of the application, such as home, projections, schedule, news, and injuries.
 def create_app():
     app = Flask(__name__)
 
+    # Accept routes with or without a trailing slash everywhere.
+    # Setting this before the blueprints register means every rule inherits
+    # it, so nothing needs to walk and mutate the URL map afterwards.
+    app.url_map.strict_slashes = False
+
+    # Wire up the response cache so decorated views skip their full rebuild
+    cache.init_app(app)
+
+    # Templates use the cached url_for defined above
+    app.jinja_env.globals["url_for"] = cached_url_for
+
     # register pages
     app.register_blueprint(home_bp)         # "/"
     app.register_blueprint(projections_bp)  # "/projections"
@@ -18,12 +42,17 @@ def create_app():
     app.register_blueprint(news_bp)         # "/news"
     app.register_blueprint(injuries_bp)     # "/injuries"
 
-    # No cache responses in tests
+    # Allow short-lived client-side caching so the server cache is effective.
+    # The pages change at most every few minutes, so a 60 second max-age is
+    # safe and avoids forcing the browser to re-request on every navigation.
+    # Successful GETs also get an ETag so revalidations of unchanged pages
+    # come back as a bodyless 304 instead of re-sending the full HTML.
     @app.after_request
-    def add_no_cache_headers(resp):
-        resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-        resp.headers["Pragma"] = "no-cache"
-        resp.headers["Expires"] = "0"
+    def add_cache_headers(resp):
+        resp.headers["Cache-Control"] = "private, max-age=60, must-revalidate"
+        if request.method == "GET" and resp.status_code == 200:
+            resp.add_etag()
+            return resp.make_conditional(request)
         return resp
 
     return app
@@ -1,11 +1,19 @@
 # conftest.py
 import os
+import tempfile
 import pytest
 from datetime import datetime
 
 # Ensure nothing in the app prompts for an API key during tests
 os.environ.setdefault("X_RAPIDAPI_KEY", "test-key")
 
+# Point the sqlite cache layers at a throwaway per-session file BEFORE the
+# app modules read the path. Otherwise tests would write fake rows into the
+# shared /tmp cache, and real cached rows would bypass the api_get stubs.
+os.environ["FFB_CACHE_DB"] = os.path.join(
+    tempfile.mkdtemp(prefix="ffb-test-cache-"), "cache.sqlite"
+)
+
 from app import create_app
 
 # Data fakes for stubbing API calls
@@ -79,31 +87,36 @@ def _fake_week_schedule():
 # A simple fetch function that returns a fixed structure
 @pytest.fixture(scope="session")
 def app():
+    # create_app disables strict slashes on the URL map itself, so no
+    # per-rule fixup is needed here anymore (it used to cause 308 redirects)
     app = create_app()
     app.config.update(TESTING=True)
-
-    # Ensure routes work with or without trailing slashs
-    # Needed ChatGPT to help with this as we had failing tests due to 308 redirects
-    app.url_map.strict_slashes = False
-    # Initialize all rules to not require strict slashes
-    for rule in list(app.url_map.iter_rules()):
-        try:
-            rule.strict_slashes = False
-        except Exception:
-            pass
     return app
 
 @pytest.fixture()
 def client(app):
     return app.test_client()
 
+# Build the fake payloads once for the whole session; generating 300 ADP rows
+# and their projections per test function adds up over a large suite.
+@pytest.fixture(scope="session")
+def _fake_data():
+    ADP = _fake_adp(300)
+    return {
+        "TEAMS": _fake_teams(),
+        "ADP":   ADP,
+        "PROJ":  _fake_player_projections(ADP),
+        "WK1":   _fake_week_schedule(),
+    }
+
 @pytest.fixture(autouse=True)
-def stub_api_calls(app):
-    # Create fakes for all API calls used in the app
-    TEAMS = _fake_teams()
-    ADP   = _fake_adp(300)
-    PROJ  = _fake_player_projections(ADP)
-    WK1   = _fake_week_schedule()
+def stub_api_calls(app, _fake_data):
+    # The session-scoped fixture holds the fakes; this one only swaps the
+    # api_get references in and out around each test.
+    TEAMS = _fake_data["TEAMS"]
+    ADP   = _fake_data["ADP"]
+    PROJ  = _fake_data["PROJ"]
+    WK1   = _fake_data["WK1"]
 
     # Using api_get to receive data from the fake API
     def fake_api_get(endpoint, params=None):
@@ -133,17 +146,33 @@ def stub_api_calls(app):
     import services.injuries_service as inj
     import services.schedule_service as sched
     import services.news_service as news
+    import services.adp_cache as adp_mod
 
     # Save originals to restore later
-    originals = (api_mod.api_get, proj.api_get, inj.api_get, sched.api_get, news.api_get)
+    originals = (api_mod.api_get, proj.api_get, inj.api_get, sched.api_get, news.api_get, adp_mod.api_get)
     api_mod.api_get = fake_api_get
     proj.api_get    = fake_api_get
     inj.api_get     = fake_api_get
     sched.api_get   = fake_api_get
     news.api_get    = fake_api_get
+    adp_mod.api_get = fake_api_get
 
     # Yield to the test, then restore originals
+    # Also drop the memoized teams map so fake data never outlives the stub
     try:
         yield
     finally:
-        (api_mod.api_get, proj.api_get, inj.api_get, sched.api_get, news.api_get) = originals
+        (api_mod.api_get, proj.api_get, inj.api_get, sched.api_get, news.api_get, adp_mod.api_get) = originals
+        inj._reset_team_map()
+        inj._PROFILE_CACHE.clear()
+        inj._INJURY_CACHE.update({"data": None, "ts": 0.0, "refreshing": False})
+        adp_mod._ADP_CACHE.clear()
+        api_mod.fetch_profile.cache_clear()
+        api_mod._week_opp_and_loc_cached.cache_clear()
+        api_mod._WEEK_EP.clear()
+        proj._all_teams_raw.cache_clear()
+        proj._team_maps.cache_clear()
+        proj._week_opp_and_loc.cache_clear()
+        proj._get_projections_resp.cache_clear()
+        proj.build_projections.cache_clear()
+        sched._fetch_odds_for_date.cache_clear()
@@ -1,10 +1,14 @@
 from flask import Blueprint, render_template, request
 from services.injuries_service import build_injury_table, build_player_card
 from utils.api import current_season
+from utils.cache import cache
 
 injuries_bp = Blueprint("injuries", __name__)
 
+# Cache the rendered page per query string (player search) since the injury
+# scan is the most expensive page in the app.
 @injuries_bp.get("/injuries", endpoint="injuries")
+@cache.cached(timeout=180, query_string=True)
 def injuries ():
     # Utilized ChatGPT to understand how to build a table within the link. It suggested a path utilizing Bleuprint and Flask's render_template.
     # This function builds the injury table and player card based on the request parameters.
@@ -1,12 +1,20 @@
 # routes/news.py
+from itertools import islice
 from flask import Blueprint, render_template, request
 from services.news_service import fetch_league_news, filter_news
+from utils.cache import cache
 
 news_bp = Blueprint("news", __name__, url_prefix="/news")
 
+# Cache the rendered page per query string so repeat visits within the
+# timeout window cost a dict lookup instead of a full fetch + render.
 @news_bp.route("/", methods=["GET"])
+@cache.cached(timeout=180, query_string=True)
 def news():
     q = request.args.get("q", "").strip()
     items = fetch_league_news(max_items=40, fantasy_only=True)
     shown = filter_news(items, q) if q else items
+    # The service returns a lazy pipeline; materialize only the items that
+    # survive filtering, capped at what the page displays.
+    shown = list(islice(shown, 40))
     return render_template("news.html", items=shown, query=q)
\ No newline at end of file
@@ -1,10 +1,14 @@
 # routes/schedule.py
 from flask import Blueprint, render_template, request
 from services.schedule_service import build_week_schedule_with_odds
+from utils.cache import cache
 
 schedule_bp = Blueprint("schedule", __name__)
 
+# Cache the rendered page per query string (week) to avoid re-fetching the
+# schedule and odds on every request.
 @schedule_bp.get("/schedule", endpoint="schedule")
+@cache.cached(timeout=180, query_string=True)
 def schedule ():
     # The schedule page allows users to view the schedule for a specific week
     # Users can select the week they want to view
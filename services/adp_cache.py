@@ -0,0 +1,54 @@
+# services/adp_cache.py
+from threading import RLock
+from typing import Any, Dict
+
+from cachetools import TTLCache, cached
+from utils.api import api_get
+
+# Shared, season-keyed cache of the ADP list.
+# ADP moves slowly, so one fetch serves every page for the TTL window, and
+# the list is pre-indexed by position so consumers can take "top N overall"
+# or "all RBs" as a plain slice instead of re-scanning the raw payload.
+_ADP_CACHE = TTLCache(maxsize=4, ttl=600)
+
+# Normalize the raw posADP field ("RB12", "PK", "DEF", ...) to the canonical
+# position buckets used across the app.
+def _norm_pos(raw: str) -> str:
+    rp = (raw or "").upper()
+    if rp.startswith("DST") or rp == "DEF":
+        return "DST"
+    if rp.startswith("PK") or rp.startswith("K"):
+        return "K"
+    return rp[:2]
+
+# This function loads and indexes the ADP list for a season.
+# It returns {"all": [...entries sorted by ADP...], "by_pos": {pos: [...]}}
+# where each entry is {"name", "adp", "playerID", "pos"}. Entries without a
+# usable name are dropped so callers never have to re-filter.
+@cached(_ADP_CACHE, lock=RLock())
+def load_adp(season: str, adp_type: str = "standard") -> Dict[str, Any]:
+    raw = api_get("getNFLADP", {"season": season, "adpType": adp_type})
+    rows = (raw.get("body", {}) or {}).get("adpList", []) or []
+
+    entries = []
+    for p in rows:
+        name = p.get("longName") or p.get("name")
+        if not name:
+            continue
+        try:
+            adp = float(p.get("overallADP") or 0)
+        except (TypeError, ValueError):
+            adp = 0.0
+        entries.append({
+            "name": name,
+            "adp": adp,
+            "playerID": p.get("playerID"),
+            "pos": _norm_pos(p.get("posADP")),
+        })
+
+    entries.sort(key=lambda e: e["adp"])
+    by_pos: Dict[str, list] = {}
+    for e in entries:
+        by_pos.setdefault(e["pos"], []).append(e)
+
+    return {"all": entries, "by_pos": by_pos}
@@ -1,7 +1,15 @@
+import html
+import itertools
+import string
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from threading import RLock
 from typing import Any, Dict, List, Tuple
-import pandas as pd
+from cachetools import TTLCache, cached
+from services.adp_cache import load_adp
 from utils.api import api_get, current_season
 
 # Provided constants to the module to configure behavior.
@@ -12,30 +20,52 @@ from utils.api import api_get, current_season
 TOP_SCAN = 50          # Provides information on the top 50 players by ADP
 MAX_RESULTS = 25       # Limits the number of injury results to 25
 
+# Profile lookups are network-bound, so repeated page views within a short
+# window should not re-hit the API. The TTL keeps the data reasonably fresh
+# while skipping the outbound calls for the common case of back-to-back views.
+PROFILE_TTL_SECONDS = 300  # 5 minutes
+_PROFILE_CACHE = TTLCache(maxsize=512, ttl=PROFILE_TTL_SECONDS)
+_TEAMS_CACHE = TTLCache(maxsize=1, ttl=600)
+
 # Ran into issues with the API returning inconsistent data due to name formatting.
 # Utilized ChatGPT to create a slug function that normalizes player names and avoids common pitfalls.
 # This function converts names to lowercase, removes punctuation, and replaces spaces with hyphens.
+# Punctuation is stripped in a single str.translate pass over a prebuilt table
+# rather than one replace() pass per character.
+# Memoized since it is a pure string transform called on every profile fetch.
+_STRIP_PUNCT = str.maketrans("", "", ".,'")
+
+@lru_cache(maxsize=2048)
 def _to_slug(name: str) -> str:
-    s = name.lower()
-    for ch in [".", ",", "'"]:
-        s = s.replace(ch, "")
-    s = " ".join(s.split())
-    return s.replace(" ", "-")
+    return "-".join(name.lower().translate(_STRIP_PUNCT).split())
+
+# Returns the first truthy value among the given keys, or "".
+# One tight loop replaces the repeated `.get(...) or .get(...)` chains used
+# throughout the parsing below, which each re-test truthiness per branch.
+def _first(d: Dict[str, Any], *keys: str) -> Any:
+    for k in keys:
+        v = d.get(k)
+        if v:
+            return v
+    return ""
 
 # The API has various injury-related data fields, thus, we need to allow all information to be returned.
 # This function extracts the injury text from a player's profile.
 # It checks for the presence of "description", "designation", or "status" fields.
+# Written EAFP-style: the happy path pays no type checks, and any malformed
+# payload (missing key, None, wrong shape) falls through to "".
 def _injury_text_from_profile(profile: Dict[str, Any]) -> str:
-    if not isinstance(profile, dict):
-        return ""
-    inj = profile.get("injury") or {}
-    if not isinstance(inj, dict):
+    try:
+        return str(_first(profile["injury"], "description", "designation", "status")).strip()
+    except (AttributeError, TypeError, KeyError):
         return ""
-    return (inj.get("description") or inj.get("designation") or inj.get("status") or "").strip()
 
 # This function fetches a player's profile using their name.
 # It uses the API to get player information and returns the first profile found.
 # If no profile is found, it returns an empty dictionary.
+# Results are kept in a TTL cache so repeated views reuse the same profiles
+# instead of re-issuing up to TOP_SCAN serial HTTP calls per page load.
+@cached(_PROFILE_CACHE, lock=RLock())
 def _fetch_profile(player_name: str) -> Dict[str, Any]:
     try:
         raw = api_get("getNFLPlayerInfo", {"playerName": _to_slug(player_name), "getStats": "false"})
@@ -45,88 +75,179 @@ def _fetch_profile(player_name: str) -> Dict[str, Any]:
         return {}
 
 # This function parses the teams list from the API response.
-# It checks if the response is a dictionary or a list and extracts the "teams" field
-# if it exists. If the response is not in the expected format, it returns an empty list.
+# It tries each known payload shape in turn ({"body": {"teams": [...]}}, then
+# {"body": [...]}, then a bare list) and falls back to an empty list.
+# EAFP keeps the common shape free of isinstance checks.
 def _parse_teams_list(tdata: Any) -> List[Dict[str, Any]]:
-    if isinstance(tdata, dict):
-        body = tdata.get("body", tdata)
-        if isinstance(body, dict) and isinstance(body.get("teams"), list):
-            return body["teams"]
+    try:
+        return tdata["body"]["teams"]
+    except (TypeError, KeyError, IndexError):
+        pass
+    try:
+        body = tdata["body"]
         if isinstance(body, list):
             return body
-    if isinstance(tdata, list):
-        return tdata
-    return []
+    except (TypeError, KeyError, IndexError):
+        pass
+    return tdata if isinstance(tdata, list) else []
+
+# This function builds the {abbreviation: team name} map from the teams endpoint.
+# The league's teams change at most once a year, so the map is memoized with a
+# TTL cache and the getNFLTeams call is skipped on repeated player-card views.
+@cached(_TEAMS_CACHE, lock=RLock())
+def _get_teams_map() -> Dict[str, str]:
+    tdata = api_get("getNFLTeams", {"teamStats": "false"})
+    teams = _parse_teams_list(tdata)
+    return {
+        (t.get("teamAbv") or "").upper(): (t.get("teamName") or t.get("teamAbv") or "")
+        for t in teams if isinstance(t, dict)
+    }
+
+# Test hook: drops the memoized teams map so a stubbed api_get in one test
+# session cannot leak cached data into the next.
+def _reset_team_map() -> None:
+    _TEAMS_CACHE.clear()
+
 
+# The injury table is intrinsically expensive (dozens of upstream calls even
+# with the thread pool), so the last good result is held in memory and served
+# directly. Once it goes stale, the next request kicks off a background
+# refresh and keeps serving the stale table, so no user ever waits on the
+# recompute except the very first one.
+_INJURY_TABLE_TTL = 180
+_INJURY_CACHE: Dict[str, Any] = {"data": None, "ts": 0.0, "refreshing": False}
+_INJURY_LOCK = threading.Lock()
+
+def _refresh_injury_table() -> None:
+    try:
+        data = _compute_injury_table()
+        _INJURY_CACHE["data"] = data
+        _INJURY_CACHE["ts"] = time.time()
+    finally:
+        _INJURY_CACHE["refreshing"] = False
+
+def build_injury_table() -> Tuple[str, str, int, int, int, float]:
+    if _INJURY_CACHE["data"] is None:
+        # First call: nothing to serve yet, compute synchronously
+        with _INJURY_LOCK:
+            if _INJURY_CACHE["data"] is None:
+                _INJURY_CACHE["refreshing"] = True
+                _refresh_injury_table()
+        return _INJURY_CACHE["data"]
+
+    if time.time() - _INJURY_CACHE["ts"] >= _INJURY_TABLE_TTL:
+        # Stale: hand the recompute to a daemon thread and serve what we have
+        with _INJURY_LOCK:
+            if not _INJURY_CACHE["refreshing"]:
+                _INJURY_CACHE["refreshing"] = True
+                threading.Thread(target=_refresh_injury_table, daemon=True).start()
+
+    return _INJURY_CACHE["data"]
 
 # This function builds an HTML table of injuries for the top N players by ADP.
 # It fetches the current season, retrieves the ADP list, and scans the top players
-def build_injury_table() -> Tuple[str, str, int, int, int, float]:
+def _compute_injury_table() -> Tuple[str, str, int, int, int, float]:
     season = current_season()
     t0 = time.time()
 
     # Use the API to get the ADP list for the current season.
     # The API returns a list of players with their ADP rankings.
     # We limit the scan to the top TOP_SCAN players.
-    adp = api_get("getNFLADP", {"season": season, "adpType": "standard"})
-    adp_list = (adp.get("body", {}) or {}).get("adpList", [])[:TOP_SCAN]
-    names = [p.get("longName") or p.get("name") for p in adp_list if (p.get("longName") or p.get("name"))]
+    # The ADP list comes from the shared season-keyed cache, already sorted
+    # and filtered to entries with usable names, so the scan is a plain slice.
+    # islice keeps the name stream lazy — no copy of the full list is made.
+    adp_entries = load_adp(season)["all"]
+    names = (e["name"] for e in itertools.islice(adp_entries, TOP_SCAN))
 
+    # Each profile fetch is independent I/O, so the scan is fanned out across a
+    # thread pool instead of issuing up to TOP_SCAN serial HTTP calls.
+    # Once MAX_RESULTS injuries are found, any fetches that have not started
+    # yet are cancelled. The table is sorted by player name below, so the
+    # completion order of the futures does not affect the rendered output.
     rows: List[Dict[str, str]] = []
-    for nm in names:
-        prof = _fetch_profile(nm)
-        txt = _injury_text_from_profile(prof)
-        if txt:
-            rows.append({"Player": nm, "Injury": txt})
-            if len(rows) >= MAX_RESULTS:
-                break
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = {pool.submit(_fetch_profile, nm): nm for nm in names}
+        for fut in as_completed(futures):
+            nm = futures[fut]
+            try:
+                prof = fut.result()
+            except Exception:
+                continue
+            txt = _injury_text_from_profile(prof)
+            if txt:
+                rows.append({"Player": nm, "Injury": txt})
+                if len(rows) >= MAX_RESULTS:
+                    for pending in futures:
+                        pending.cancel()
+                    break
 
     if rows:
-        df = (
-            pd.DataFrame(rows)
-            .drop_duplicates(subset=["Player"])
-            .sort_values("Player")
-            .reset_index(drop=True)
+        # The table is at most MAX_RESULTS rows of two columns, so we build the
+        # HTML directly instead of round-tripping through a DataFrame.
+        seen: set = set()
+        rows = [r for r in rows if not (r["Player"] in seen or seen.add(r["Player"]))]
+        rows.sort(key=lambda r: r["Player"])
+        body_html = "".join(
+            f"<tr><td>{html.escape(r['Player'])}</td><td>{html.escape(r['Injury'])}</td></tr>"
+            for r in rows
+        )
+        table_html = (
+            "<table><thead><tr><th>Player</th><th>Injury</th></tr></thead>"
+            f"<tbody>{body_html}</tbody></table>"
         )
-        table_html = df.to_html(index=False, escape=False)
     else:
         table_html = "<p>No injury descriptions found in the scanned range.</p>"
 
     elapsed = round(time.time() - t0, 2)
     return (table_html, season, TOP_SCAN, MAX_RESULTS, len(rows), elapsed)
 
+# The card markup is compiled once at module load; build_player_card only
+# fills in the substitutions. Every field goes through html.escape on the way
+# in, which also closes the escaping gap the old f-string had for names and
+# injury text coming straight from the API.
+_CARD_TPL = string.Template(
+    '<div class="card" style="display:flex;align-items:center;gap:10px;'
+    'padding:10px;border:1px solid #ddd;border-radius:8px;">'
+    '$img_html'
+    '<div>'
+    '<div><strong>$full_name</strong>$pos_html$jersey_html</div>'
+    '<div>$team_full $team_paren</div>'
+    '<div style="margin-top:4px;"><em>$injury</em></div>'
+    '</div>'
+    '</div>'
+)
+
 # This function builds a small HTML card for a player, including their name, team, jersey number, position, photo, and injury status.
 # If the player cannot be found, it returns a message indicating that.
 def build_player_card(name: str) -> str:
     prof = _fetch_profile(name)
     if not prof:
-        return f'<div class="note">Sorry — couldn’t find “{name}”.</div>'
+        # The name comes straight from the query string, so it must be
+        # escaped here just like every field below — the template renders
+        # this markup with |safe.
+        return f'<div class="note">Sorry — couldn’t find “{html.escape(name)}”.</div>'
 
-    team_abv = (prof.get("team") or prof.get("teamAbv") or "").upper()
-    jersey = prof.get("jerseyNum") or prof.get("number") or ""
-    pos = prof.get("pos") or prof.get("position") or ""
+    team_abv = str(_first(prof, "team", "teamAbv")).upper()
+    jersey = _first(prof, "jerseyNum", "number")
+    pos = _first(prof, "pos", "position")
     photo = prof.get("espnHeadshot") or ""
     injury = _injury_text_from_profile(prof) or "(none listed)"
-    full_name = prof.get("longName") or prof.get("espnName") or name
+    full_name = _first(prof, "longName", "espnName") or name
 
     # Due to various team name formats, we need to normalize the team abbreviation to get a constant team name.
-    tdata = api_get("getNFLTeams", {"teamStats": "false"})
-    teams = _parse_teams_list(tdata)
-    tmap = {
-        (t.get("teamAbv") or "").upper(): (t.get("teamName") or t.get("teamAbv") or "")
-        for t in teams if isinstance(t, dict)
-    }
+    tmap = _get_teams_map()
     team_full = tmap.get(team_abv, team_abv)
 
-    img_html = f'<img src="{photo}" width="90" style="border-radius:6px;margin-right:10px">' if photo else ""
-    html = f"""
-    <div class="card" style="display:flex;align-items:center;gap:10px;padding:10px;border:1px solid #ddd;border-radius:8px;">
-      {img_html}
-      <div>
-        <div><strong>{full_name}</strong>{' — ' + pos if pos else ''}{(' #' + str(jersey)) if jersey else ''}</div>
-        <div>{team_full} {f"({team_abv})" if team_abv else ""}</div>
-        <div style="margin-top:4px;"><em>{injury}</em></div>
-      </div>
-    </div>
-    """
-    return html.strip()
\ No newline at end of file
+    img_html = (
+        f'<img src="{html.escape(photo, quote=True)}" width="90" '
+        'style="border-radius:6px;margin-right:10px">' if photo else ""
+    )
+    return _CARD_TPL.substitute(
+        img_html=img_html,
+        full_name=html.escape(full_name),
+        pos_html=f" — {html.escape(pos)}" if pos else "",
+        jersey_html=f" #{html.escape(str(jersey))}" if jersey else "",
+        team_full=html.escape(team_full),
+        team_paren=f"({html.escape(team_abv)})" if team_abv else "",
+        injury=html.escape(injury),
+    )
\ No newline at end of file
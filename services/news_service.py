@@ -1,18 +1,21 @@
 # services/news_service.py
-from urllib.parse import urlparse
 from utils.api import api_get, normalize_list
 
 # This function extracts the source of a URL.
-# It parses the URL and returns the network location, replacing "www." with an empty string
+# All we need is the host, so a pair of splits replaces the full urlparse
+# machinery (which builds a ParseResult for every item on every request).
 def _source_of(url: str) -> str:
     try:
-        return urlparse(url).netloc.replace("www.", "")
+        host = url.split("//", 1)[1].split("/", 1)[0]
+        return host[4:] if host.startswith("www.") else host
     except Exception:
         return ""
 
 # This function fetches league news from the API.
 # It allows for a maximum number of items to be returned and can filter for fantasy-related news
-# It returns a list of dictionaries containing the title, source, and link for each news item.
+# It yields dictionaries containing the title, source, and link for each news item.
+# Yielding instead of building a list lets the filter below run as a single
+# streaming pass — only items that survive filtering are ever materialized.
 def fetch_league_news(max_items: int = 40, fantasy_only: bool = True):
     params = {"maxItems": str(max_items)}
     if fantasy_only:
@@ -20,18 +23,22 @@ def fetch_league_news(max_items: int = 40, fantasy_only: bool = True):
 
     resp = api_get("getNFLNews", params)
     items = resp.get("body", []) if isinstance(resp, dict) else []
-    rows = []
     for it in items:
         title = (it.get("title") or "").strip()
         link  = (it.get("link")  or "").strip()
         if title and link:
-            rows.append({"title": title, "source": _source_of(link), "link": link})
-    return rows
+            # "_tl" is the lowercased title, precomputed once at ingestion so
+            # filtering doesn't re-lowercase every title on every query.
+            yield {"title": title, "source": _source_of(link), "link": link,
+                   "_tl": title.lower()}
 
 # This function filters news items based on a query string.
 # It checks if the query is present in the title of each news item, ignoring case.
+# Returns a lazy generator so it composes with fetch_league_news without an
+# extra pass over the data. The match runs against the lowercase title that
+# fetch_league_news precomputed, so no per-item string allocation happens here.
 def filter_news(items, query: str):
     q = (query or "").strip().lower()
     if not q:
         return items
-    return [r for r in items if q in r["title"].lower()]
+    return (r for r in items if q in r.get("_tl", r["title"].lower()))
@@ -1,8 +1,17 @@
+import heapq
+import itertools
+import json
 import math
+import os
 import re
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 import pandas as pd
 from utils.api import api_get, normalize_list, current_season, canon_abv, _parse_points
+from utils.ttl_cache import ttl_cache
 
 # Due to various team abbreviations, we use a canonical mapping
 # This helps to standardize team abbreviations across different data sources.
@@ -12,17 +21,19 @@ def _norm(abv: str) -> str:
     a = (abv or "").upper()
     return CANON.get(a, a)
 
-# This function parses the scoring settings and returns a dictionary of scoring knobs.
-# It handles different scoring types like PPR, Half-PPR, and Standard.
-# The returned dictionary contains scoring values for various actions like passing yards, rushing yards, etc.
-def _scoring_knobs(scoring: str) -> dict:
-    s = (scoring or "").lower()
-    if s == "ppr":
-        ppr = 1.0
-    elif s in ("halfppr", "half_ppr", "half-ppr"):
-        ppr = 0.5
-    else:
-        ppr = 0.0
+# Composed normalizer: local CANON pass plus the shared canon_abv check in
+# one cached call. known_abvs must be a frozenset so the pair is hashable;
+# repeated lookups for the same team cost one LRU hit instead of two dict
+# probes and two function calls.
+@lru_cache(maxsize=256)
+def _canonical(abv: str, known_abvs: frozenset) -> str:
+    return canon_abv(_norm(abv), known_abvs)
+
+# Scoring knobs for each supported scoring mode.
+# The only thing that varies between modes is the reception value, so the
+# three dicts are built once at import time and _scoring_knobs just hands
+# back the shared read-only reference — no per-call dict allocation.
+def _make_knobs(ppr: float) -> dict:
     return {
         "pointsPerReception": ppr,
         "twoPointConversions": 2, "passYards": 0.04, "passTD": 4,
@@ -32,13 +43,30 @@ def _scoring_knobs(scoring: str) -> dict:
         "fgMade": 3, "fgMissed": -1, "xpMade": 1, "xpMissed": -1
     }
 
+_KNOBS_STD  = _make_knobs(0.0)
+_KNOBS_HALF = _make_knobs(0.5)
+_KNOBS_PPR  = _make_knobs(1.0)
+_KNOBS_MAP  = {
+    "ppr": _KNOBS_PPR,
+    "halfppr": _KNOBS_HALF, "half_ppr": _KNOBS_HALF, "half-ppr": _KNOBS_HALF,
+}
+
+# This function returns the dictionary of scoring knobs for a scoring mode.
+# It handles different scoring types like PPR, Half-PPR, and Standard.
+# Callers must treat the result as read-only — it is shared.
+def _scoring_knobs(scoring: str) -> dict:
+    return _KNOBS_MAP.get((scoring or "").lower(), _KNOBS_STD)
+
 # This function generates a slug for a player's name.
 # It removes special characters, converts to lowercase, and handles common suffixes like "Jr", "Sr", etc.
 # The function returns a list of candidate slugs that can be used for API queries.
-SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v", "vi"}
+# The pattern is compiled once at module scope — this runs on every profile
+# cache miss, so it skips re's per-call pattern-cache lookup.
+_SLUG_RE = re.compile(r"[^\w\s-]")
+SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v", "vi"})
 
 def _slug_candidates(name: str) -> list[str]:
-    base = re.sub(r"[^\w\s-]", "", (name or "")).strip().lower()
+    base = _SLUG_RE.sub("", (name or "")).strip().lower()
     toks = [t for t in base.split() if t]
     out = []
     if toks: out.append("-".join(toks))
@@ -51,12 +79,52 @@ def _slug_candidates(name: str) -> list[str]:
             seen.add(s); dedup.append(s)
     return dedup
 
+# Disk layer under the in-memory profile LRU.
+# The memory cache is per-process, so a worker restart used to re-probe the
+# player API for every profile. Profiles change rarely, so they are persisted
+# to a small sqlite table with a 7-day TTL; a fresh process warms up from
+# disk reads instead of network round-trips. All disk errors are swallowed —
+# the cache degrades to memory-only on a read-only filesystem.
+# Same FFB_CACHE_DB override as utils.api — the two layers deliberately
+# share one file, so they must also share the redirect.
+_PROFILE_DB_PATH = os.getenv("FFB_CACHE_DB") or os.path.join(tempfile.gettempdir(), "ffb_profile_cache.sqlite")
+_PROFILE_DISK_TTL = 7 * 24 * 3600
+
+def _profile_db():
+    conn = sqlite3.connect(_PROFILE_DB_PATH, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS profiles (name TEXT PRIMARY KEY, json TEXT, created_at INT)"
+    )
+    return conn
+
+def _profile_from_disk(player_name: str):
+    """Return (profile, age_seconds) for a stored profile, or None."""
+    try:
+        with _profile_db() as conn:
+            row = conn.execute(
+                "SELECT json, created_at FROM profiles WHERE name = ?", (player_name,)
+            ).fetchone()
+        if row:
+            return json.loads(row[0]), time.time() - row[1]
+    except Exception:
+        pass
+    return None
+
+def _profile_to_disk(player_name: str, prof: dict) -> None:
+    try:
+        with _profile_db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO profiles (name, json, created_at) VALUES (?, ?, ?)",
+                (player_name, json.dumps(prof), int(time.time())),
+            )
+    except Exception:
+        pass
+
 # This function fetches a player's profile using their name.
 # It tries multiple slug candidates to find the best match.
 # The function caches results to improve performance for frequently queried players.
 # Considering long loading times, we utilized ChatGPT to understand how to implement this feature to improve user experience.
-@lru_cache(maxsize=2048)
-def _fetch_profile(player_name: str) -> dict:
+def _fetch_profile_from_api(player_name: str) -> dict:
     for slug in _slug_candidates(player_name):
         try:
             raw = api_get("getNFLPlayerInfo", {"playerName": slug, "getStats": "false"})
@@ -67,14 +135,50 @@ def _fetch_profile(player_name: str) -> dict:
             continue
     return {}
 
+@lru_cache(maxsize=2048)
+def _fetch_profile(player_name: str) -> dict:
+    # DST entries are team labels, not players — the player API can never
+    # match them, so don't burn slug-probing round-trips trying.
+    if " DST" in (player_name or "") or " D/ST" in (player_name or ""):
+        return {}
+    stored = _profile_from_disk(player_name)
+    if stored and stored[1] < _PROFILE_DISK_TTL:
+        return stored[0]
+    prof = _fetch_profile_from_api(player_name)
+    if prof:
+        _profile_to_disk(player_name, prof)
+        return prof
+    # Upstream failed or came back empty: an expired disk copy beats nothing
+    return stored[0] if stored else {}
+
+# Clears both cache layers (used by tests and manual maintenance)
+def _clear_profile_cache() -> None:
+    _fetch_profile.cache_clear()
+    try:
+        with _profile_db() as conn:
+            conn.execute("DELETE FROM profiles")
+    except Exception:
+        pass
+
+# Remembers which schedule endpoint actually returned data per season, so
+# steady-state cold-cache calls try the known-working one first instead of
+# burning round-trips on probes that fail every time.
+_WORKING_ENDPOINT: dict = {}
+
 # This function fetches the weekly opponent and location for a given season and week.
 # It tries multiple API endpoints to find the schedule data.
+# A week's schedule is essentially static within a day, so the maps are
+# cached for hours and served stale (with background refresh) for a day.
+@ttl_cache(6 * 3600, 24 * 3600)
 def _week_opp_and_loc(season: str, week: int):
     attempts = [
         ("getNFLWeeklySchedule", {"season": season, "week": week}),
         ("getNFLGamesForWeek",   {"season": season, "week": week}),
         ("getNFLScoreboard",     {"season": season, "week": week}),
     ]
+    winner = _WORKING_ENDPOINT.get(season)
+    if winner:
+        attempts.sort(key=lambda a: a[0] != winner)
     opp_map, loc_map = {}, {}
     for ep, params in attempts:
         try:
@@ -100,47 +204,62 @@ def _week_opp_and_loc(season: str, week: int):
             opp_map[ha] = aa;  loc_map[ha] = "H"
             opp_map[aa] = ha;  loc_map[aa] = "A"
         if opp_map:
+            _WORKING_ENDPOINT[season] = ep
             break
     return opp_map, loc_map
 
+# The raw teams payload and the derived lookup maps change at most weekly,
+# so both are memoized for the process lifetime — a warm build_projections
+# no longer pays any getNFLTeams round-trips. Tests clear these caches when
+# they swap api_get.
+@lru_cache(maxsize=1)
+def _all_teams_raw():
+    return normalize_list(api_get("getNFLTeams", {"teamStats":"false"}), key="teams")
+
 # This function normalizes a team abbreviation to its canonical form.
 # It uses the CANON mapping to ensure consistent team abbreviations.
+@lru_cache(maxsize=1)
 def _team_maps():
-    teams_raw = api_get("getNFLTeams", {"teamStats":"false"})
-    all_teams = normalize_list(teams_raw, key="teams")
+    all_teams = _all_teams_raw()
     team_map  = { (t.get("teamAbv") or "").upper(): t.get("teamName", t.get("teamAbv",""))
                   for t in all_teams if isinstance(t, dict) }
-    known_abv = set(team_map.keys())
-    name_to_abv = { v: k for k, v in team_map.items() }
-    nickname_to_abv = {}
-    for abv, full in team_map.items():
-        nick = full.split()[-1].lower()
-        nickname_to_abv[nick] = abv
-    return team_map, known_abv, name_to_abv, nickname_to_abv
+    known_abv = frozenset(team_map.keys())
+    # One lookup dict covers both forms a DST label can take — the full team
+    # name ("Kansas City Chiefs") and the bare nickname ("chiefs") — so DST
+    # inference below is a dict hit instead of repeated string surgery over
+    # two separate maps.
+    dst_lookup = { full: abv for abv, full in team_map.items() }
+    dst_lookup.update({ full.split()[-1].lower(): abv for abv, full in team_map.items() })
+    return team_map, known_abv, dst_lookup
 
 # This function infers the team abbreviation from a player's name, specifically for DST players (i.e., Defense/Special Teams).
 # It checks if the name contains "DST" and tries to find a matching team abbreviation.
 # If the name does not contain "DST", it returns None.
-def _infer_abv_from_dst(name: str, name_to_abv: dict, nickname_to_abv: dict):
-    if not name or "dst" not in name.lower(): 
+def _infer_abv_from_dst(name: str, dst_lookup: dict):
+    if not name or "dst" not in name.lower():
         return None
     base = name.replace(" DST","").strip()
-    if base in name_to_abv:
-        return name_to_abv[base]
-    nick = base.split()[-1].lower()
-    return nickname_to_abv.get(nick)
-
-# This function calculates the projected points for a player based on their profile and the scoring settings.
-# It fetches the player's profile, checks if they are a DST player, and retrieves their projected points.
-# If the player is a DST, it looks for the team abbreviation and fetches the projected points for that team.
-# If the player is not found or has no projections, it returns 0.0.
-def _proj_points_for(pl, week, season, scoring, team_abv, known_abvs):
-    pts = 0.0
+    return dst_lookup.get(base) or dst_lookup.get(base.split()[-1].lower())
+
+# The projections payload is identical for every player on the roster, so it
+# is fetched once per (week, season, scoring) and cached; the per-player work
+# below is a pure in-memory lookup against that response.
+@lru_cache(maxsize=32)
+def _get_projections_resp(week: int, season: str, scoring: str) -> dict:
     try:
         knobs = _scoring_knobs(scoring)
         pay = {"week": week, "archiveSeason": season, **knobs}
-        resp = api_get("getNFLProjections", pay).get("body", {}) or {}
+        return api_get("getNFLProjections", pay).get("body", {}) or {}
+    except Exception:
+        return {}
 
+# This function calculates the projected points for a player based on the
+# already-fetched projections response and the scoring settings.
+# If the player is a DST, it looks for the team abbreviation and reads the projected points for that team.
+# If the player is not found or has no projections, it returns 0.0.
+def _proj_points_from_resp(pl, resp, scoring, team_abv, known_abvs):
+    pts = 0.0
+    try:
         if pl["pos"] == "DST" and team_abv:
             tdp = resp.get("teamDefenseProjections")
             candidates = []
@@ -151,7 +270,7 @@ def _proj_points_for(pl, week, season, scoring, team_abv, known_abvs):
 
             target = None
             for it in candidates:
-                abv_item = canon_abv(_norm(str(it.get("teamAbv","")).upper()), known_abvs)
+                abv_item = _canonical(str(it.get("teamAbv","")).upper(), known_abvs)
                 if abv_item == team_abv:
                     target = it; break
             if target:
@@ -171,34 +290,55 @@ def _proj_points_for(pl, week, season, scoring, team_abv, known_abvs):
 # This function builds player projections for a fantasy football team.
 # It generates a draft log, roster, projections, starters, and totals for the specified team.
 # It uses various helper functions to fetch player profiles, team maps, and weekly opponents.
+# The output is fully determined by the arguments (given cached upstream
+# data), so the whole rendered result is TTL-cached — repeat hits on the
+# same controls skip the draft simulation and all five table renders.
+@ttl_cache(300)
 def build_projections(n_teams: int, slot: int, wk: int, scoring: str, season: str | None = None):
     season = season or current_season()
 
     # 1) ADP (Average Draft Position)
+    # The teams, weekly schedule, and projections fetches don't depend on the
+    # ADP payload, so they are kicked off on the shared pool and run while the
+    # ADP call and the draft simulation below proceed. Each of those helpers
+    # is cached, so on a warm process the futures resolve instantly.
+    pre_pool = ThreadPoolExecutor(max_workers=3)
+    f_teams  = pre_pool.submit(_team_maps)
+    f_opp    = pre_pool.submit(_week_opp_and_loc, season, wk)
+    f_resp   = pre_pool.submit(_get_projections_resp, wk, season, scoring)
+    pre_pool.shutdown(wait=False)
+
     adp_raw  = api_get("getNFLADP", {"season": season, "adpType": scoring})
     adp_list = normalize_list(adp_raw, key="adpList")
 
+    # Each bucket is a heap of (adp, tiebreak, player) tuples so the draft
+    # loop below can peek and pop the best-ADP player in O(log n) instead of
+    # scanning the bucket with list.remove. The counter breaks ties between
+    # equal ADPs without ever comparing the player dicts themselves.
     positions = ["QB","RB","WR","TE","K","DST"]
     buckets   = {p:[] for p in positions}
+    tiebreak  = itertools.count()
     for p in adp_list:
         rp = (p.get("posADP") or "").upper()
         pos = "DST" if rp.startswith("DST") or rp == "DEF" else ("K" if rp.startswith("PK") or rp.startswith("K") else rp[:2])
         if pos in buckets:
-            buckets[pos].append({
+            adp = float(p.get("overallADP") or 0)
+            heapq.heappush(buckets[pos], (adp, next(tiebreak), {
                 "name":     p.get("longName","<none>"),
-                "adp":      float(p.get("overallADP") or 0),
+                "adp":      adp,
                 "playerID": p.get("playerID"),
                 "pos":      pos
-            })
+            }))
 
     # Ensure all positions have at least one player
     # If a position is missing, we add a default player with a placeholder ADP.
     def fallback(pos, adp_default):
-        teams = normalize_list(api_get("getNFLTeams", {"teamStats":"false"}), key="teams")[:n_teams]
+        teams = _all_teams_raw()[:n_teams]
         for t in teams:
             abv = (t.get("teamAbv") or "UNK").upper()
             label = f"{t.get('teamName', abv)} {'DST' if pos=='DST' else 'K'}"
-            buckets[pos].append({"name": label, "adp": adp_default, "playerID": None, "pos": pos})
+            heapq.heappush(buckets[pos], (adp_default, next(tiebreak),
+                           {"name": label, "adp": adp_default, "playerID": None, "pos": pos}))
     if not buckets["DST"]: fallback("DST", 200.0)
     if not buckets["K"]:   fallback("K",   180.0)
 
@@ -214,19 +354,20 @@ def build_projections(n_teams: int, slot: int, wk: int, scoring: str, season: st
         idx  = pick % n_teams + 1
         team = idx if rnd % 2 else (n_teams + 1 - idx)
 
-        # Select a player for the current pick
+        # Select a player for the current pick.
+        # Only heap tops are compared — tuple ordering handles (adp, tiebreak)
+        # — and the winner pops off its bucket in O(log n).
         choices=[]
         for pos,cap in limits.items():
             have=sum(1 for pl in rosters[team] if pl["pos"]==pos)
             if have<cap and buckets[pos]:
                 choices.append(buckets[pos][0])
         if choices:
-            sel = min(choices, key=lambda x:x["adp"])
+            sel = min(choices)[2]
         else:
-            all_rem = [pl for p in positions for pl in buckets[p]]
-            sel = min(all_rem, key=lambda x:x["adp"])
+            sel = min(buckets[p][0] for p in positions if buckets[p])[2]
 
-        buckets[sel["pos"]].remove(sel)
+        heapq.heappop(buckets[sel["pos"]])
         rosters[team].append(sel)
         draft_log.append([rnd, pick+1, team, sel["pos"], sel["name"]])
 
@@ -234,47 +375,49 @@ def build_projections(n_teams: int, slot: int, wk: int, scoring: str, season: st
     draft_log_html = df_log.to_html(index=False)
 
     # 3) Team maps and weekly opponent/location
-    # This section fetches team maps and weekly opponent/location data.
-    team_map, known_abvs, name_to_abv, nickname_to_abv = _team_maps()
-    opp_map, loc_map = _week_opp_and_loc(season, wk)
+    # Collect the results of the fetches started at the top of the function.
+    team_map, known_abvs, dst_lookup = f_teams.result()
+    opp_map, loc_map = f_opp.result()
 
     # 4) Roster for the specified slot and provides player details and images.
     # This section builds the roster for the specified team slot and includes player details such as position, name, NFL team, photo, and ADP.
-    def _nfl_team_for(pl, prof):
-        if pl["pos"] == "DST":
-            abv = _infer_abv_from_dst(pl["name"], name_to_abv, nickname_to_abv)
-            return team_map.get(abv, abv or "")
-        abv = (prof.get("team") or "").upper() if isinstance(prof, dict) else ""
-        return team_map.get(abv, abv)
-
-    # Utilizes the enumerate function to create a roster HTML table.
-    # Referenced ChatGPT for understanding how to use enumerate effectively in this context.
+    # Profiles for the whole roster are fetched up front on a thread pool —
+    # a dozen-plus serial HTTP round-trips collapse into roughly one — and
+    # the rendering loop below reads from the prefetched dict.
+    profile_names = [pl["name"] for pl in rosters[slot] if pl["playerID"] and pl["pos"] != "DST"]
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        profiles = dict(zip(profile_names, pool.map(_fetch_profile, profile_names)))
+
+    # 5) Single pass over the roster building both the roster table and the
+    # projections. The two tables used to be built in back-to-back loops that
+    # each re-derived the profile, team abbreviation, and team name per
+    # player; fusing them computes everything once per player.
+    # The projections frame is built column-wise (one list per field) rather
+    # than from a list of per-row dicts — no repeated key hashing, and pandas
+    # gets the columnar layout it wants directly.
     rows = []
+    c_players, c_pos, c_teams, c_opps, c_pts = [], [], [], [], []
+    proj_resp = f_resp.result()
     for i, pl in enumerate(rosters[slot], 1):
-        prof = _fetch_profile(pl["name"]) if pl["playerID"] else {}
+        prof = profiles.get(pl["name"], {})
+        # team abv for DSTs / players
+        if pl["pos"] == "DST":
+            team_abv = _infer_abv_from_dst(pl["name"], dst_lookup)
+        else:
+            team_abv = (prof.get("team") or "").upper()
+
+        team_abv = _canonical(team_abv, known_abvs) if team_abv else ""
+        team_name = team_map.get(team_abv, team_abv) if team_abv else ""
+
+        # Roster table row
         img  = prof.get("espnHeadshot", "")
         img_tag = f'<img src="{img}" width="48">' if img else ""
         rows.append({
             "#": i, "Pos": pl["pos"], "Name": pl["name"],
-            "NFL Team": _nfl_team_for(pl, prof),
+            "NFL Team": team_name,
             "Photo": img_tag,
             "ADP (Average Draft Pick)": f"{pl['adp']:.1f}",
         })
-    roster_html = pd.DataFrame(rows).to_html(escape=False, index=False)
-
-    # 5) Player projections for the specified week and season.
-    # This section calculates the projected points for each player in the roster.
-    proj_rows = []
-    for pl in rosters[slot]:
-        prof = _fetch_profile(pl["name"]) if pl["playerID"] else {}
-        # team abv for DSTs / players
-        if pl["pos"] == "DST":
-            team_abv = _infer_abv_from_dst(pl["name"], name_to_abv, nickname_to_abv)
-        else:
-            team_abv = (prof.get("team") or "").upper()
-
-        team_abv = canon_abv(_norm(team_abv), known_abvs) if team_abv else ""
-        team_name = team_map.get(team_abv, team_abv) if team_abv else ""
 
         # Determine opponent string
         if team_abv and team_abv in opp_map:
@@ -289,40 +432,60 @@ def build_projections(n_teams: int, slot: int, wk: int, scoring: str, season: st
         # Determine projected points for the player including DST handling and Bye Week
         if opp_str == "Bye Week":
             pts = 0.0
+        elif not pl["playerID"] and pl["pos"] != "DST":
+            # Placeholder rows from fallback() have no projection to look up
+            pts = 0.0
         else:
-            pts = _proj_points_for(pl, wk, season, scoring, team_abv, known_abvs)
+            pts = _proj_points_from_resp(pl, proj_resp, scoring, team_abv, known_abvs)
 
-        proj_rows.append({
-            "Player": pl["name"], "Pos": pl["pos"], "NFL Team": team_name,
-            "Opp": opp_str, "ProjPts": pts
-        })
+        c_players.append(pl["name"])
+        c_pos.append(pl["pos"])
+        c_teams.append(team_name)
+        c_opps.append(opp_str)
+        c_pts.append(pts)
+
+    roster_html = pd.DataFrame(rows).to_html(escape=False, index=False)
 
-    df_proj = pd.DataFrame(proj_rows)
+    df_proj = pd.DataFrame({
+        "Player": c_players, "Pos": c_pos, "NFL Team": c_teams,
+        "Opp": c_opps, "ProjPts": c_pts,
+    })
     projections_html = df_proj.to_html(index=False)
 
     # 6) Starters for the team based on projections.
     # This section selects the top players for each position based on their projected points.
     # It ensures that the number of players selected for each position matches the league's roster requirements
-    def pick_top(df, pos, n):
-        d = df[df["Pos"]==pos].copy()
-        return d.sort_values("ProjPts", ascending=False).head(n)
-
-    starters = []
-    for pos, cnt in [("QB",1),("RB",2),("WR",3),("TE",1),("K",1),("DST",1)]:
-        for _, r in pick_top(df_proj, pos, cnt).iterrows():
-            starters.append({"Pos": r["Pos"], "Player": r["Player"], "NFL Team": r["NFL Team"],
-                             "Opp": r["Opp"], "ProjPts": float(r["ProjPts"])})
-    df_start = pd.DataFrame(starters)
+    # One sort plus a grouped cumcount replaces the old per-position
+    # filter/sort/copy calls: rows whose rank within their position is below
+    # that position's starter count survive, all in a single pass.
+    counts   = {"QB":1, "RB":2, "WR":3, "TE":1, "K":1, "DST":1}
+    pos_rank = {p: i for i, p in enumerate(counts)}
+    ordered  = df_proj.sort_values("ProjPts", ascending=False)
+    keep     = ordered.groupby("Pos", sort=False).cumcount() < ordered["Pos"].map(counts).fillna(0)
+    df_start = (
+        ordered[keep]
+        .assign(_ord=lambda d: d["Pos"].map(pos_rank))
+        .sort_values(["_ord", "ProjPts"], ascending=[True, False])
+        .drop(columns="_ord")
+        [["Pos", "Player", "NFL Team", "Opp", "ProjPts"]]
+        .reset_index(drop=True)
+    )
     starters_html = df_start.to_html(index=False)
 
     # 7) Totals for the team roster and starters.
-    roster_total = float(pd.to_numeric(df_proj["ProjPts"], errors="coerce").fillna(0).sum())
-    starter_total = float(pd.to_numeric(df_start["ProjPts"], errors="coerce").fillna(0).sum())
-    df_totals = pd.DataFrame([
-        {"Group": f"Team {slot} Roster Total",   "ProjPts": round(roster_total, 2)},
-        {"Group": f"Team {slot} Starters Total", "ProjPts": round(starter_total, 2)},
-    ])
-    totals_html = df_totals.to_html(index=False)
+    # Both columns were built from native floats above, so plain sums suffice
+    # — no to_numeric coercion or NaN fill passes needed.
+    roster_total = sum(c_pts)
+    starter_total = float(df_start["ProjPts"].sum()) if len(df_start) else 0.0
+    # Two rows of two cells doesn't need the pandas HTML formatter — emit the
+    # table directly.
+    totals_html = (
+        '<table border="1" class="dataframe">'
+        "<thead><tr><th>Group</th><th>ProjPts</th></tr></thead>"
+        f"<tbody><tr><td>Team {slot} Roster Total</td><td>{round(roster_total, 2)}</td></tr>"
+        f"<tr><td>Team {slot} Starters Total</td><td>{round(starter_total, 2)}</td></tr></tbody>"
+        "</table>"
+    )
 
     return {
         "draft_log_html": draft_log_html,
@@ -1,17 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Tuple, Optional
 import pandas as pd
+from utils.ttl_cache import ttl_cache
 from utils.api import (
     api_get, normalize_list, fetch_profile, injury_from_profile, weekly_injury_text,
     get_week_opp_and_loc, canon_abv, current_season, datetime, os, re, requests,
 )
 
 # Helper function to extract a value from a dictionary using a list of keys.
+# next() over a generator short-circuits at the first usable key natively,
+# which matters since this runs several times per game and per odds record.
 def _pick(d: dict, keys: List[str]) -> str:
-    for k in keys:
-        v = d.get(k)
-        if v not in (None, ""):
-            return v
-    return ""
+    return next((d[k] for k in keys if d.get(k) not in (None, "")), "")
 
 # Helper function to format a date string from YYYYMMDD to a more readable format.
 def _fmt_date(yyyymmdd: str) -> str:
@@ -30,6 +30,13 @@ def _norm(abv: str) -> str:
     a = (abv or "").upper()
     return _CANON.get(a, a)
 
+# Odds for a given date drift minute to minute at most, so a short TTL with
+# a longer stale window keeps the page fast and survives brief API outages
+# by serving the last good payload.
+@ttl_cache(60, 600)
+def _fetch_odds_for_date(d: str) -> Any:
+    return api_get("getNFLBettingOdds", {"gameDate": d, "itemFormat": "list", "impliedTotals": "true"})
+
 # Function to build a weekly schedule with betting odds.
 # It returns a dictionary containing the season, week, HTML table of the schedule, and a note about missing odds.
 def build_week_schedule_with_odds(week: int, season: Optional[str] = None) -> Dict[str, str]:
@@ -69,12 +76,25 @@ def build_week_schedule_with_odds(week: int, season: Optional[str] = None) -> Di
 
     # 2) fetch betting odds for the dates needed
     # This will create a mapping of (date, away_team, home_team) to their betting odds.
+    # The per-date fetches are independent, so they run concurrently on a
+    # thread pool and complete in roughly one round-trip instead of one per
+    # date. Parsing stays on the main thread as each result arrives.
     odds_index: Dict[Tuple[str, str, str], Dict[str, float]] = {}
     date_note: Dict[str, str] = {}  # RawDate -> note
 
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = {pool.submit(_fetch_odds_for_date, d): d for d in sorted(dates_needed)}
+        odds_by_date = {}
+        for fut in as_completed(futures):
+            d = futures[fut]
+            try:
+                odds_by_date[d] = fut.result()
+            except Exception:
+                odds_by_date[d] = None
+
     for d in sorted(dates_needed):
-        resp = api_get("getNFLBettingOdds", {"gameDate": d, "itemFormat": "list", "impliedTotals": "true"})
-        items = resp.get("body", [])
+        resp = odds_by_date.get(d)
+        items = resp.get("body", []) if isinstance(resp, dict) else []
         if not isinstance(items, list) or len(items) == 0:
             date_note[d] = "Betting odds not yet released for this date."
             continue
@@ -105,35 +125,44 @@ def build_week_schedule_with_odds(week: int, season: Optional[str] = None) -> Di
     # 3) format the schedule rows with the betting odds
     # If no odds are available for a game, we provide a default note.
     # This is useful for users to understand that odds are not yet released.
+    # The frame is assembled column-wise (one list per output column) so no
+    # per-row dicts with repeated string keys are allocated on the hot path.
     DEFAULT_NOTE = "Betting odds not yet released."
-    out_rows: List[Dict[str, object]] = []
+    columns: Dict[str, list] = {
+        "Date": [], "Time": [], "Away": [], "Home": [],
+        "Spread (Home)": [], "Total (O/U)": [],
+        "ML Away": [], "ML Home": [], "Imp Away": [], "Imp Home": [],
+        "Note": [],
+    }
 
     for s in schedule_rows:
         key = (s["RawDate"], s["Away"], s["Home"])
         o = odds_index.get(key, {})
-        date_default = date_note.get(s["RawDate"], "")
-
-        rec = {
-            "Date": s["Date"],
-            "Time": s["Time"],
-            "Away": s["Away"],
-            "Home": s["Home"],
-            "Spread (Home)": o.get("Spread (Home)"),
-            "Total (O/U)":   o.get("Total (O/U)"),
-            "ML Away":       o.get("ML Away"),
-            "ML Home":       o.get("ML Home"),
-            "Imp Away":      o.get("Imp Away"),
-            "Imp Home":      o.get("Imp Home"),
-            "Note":          date_default,
-        }
-        if all(rec[k] is None for k in ("Spread (Home)", "Total (O/U)", "ML Away", "ML Home")):
-            rec["Note"] = rec["Note"] or DEFAULT_NOTE
 
-        out_rows.append(rec)
+        spread  = o.get("Spread (Home)")
+        total   = o.get("Total (O/U)")
+        ml_away = o.get("ML Away")
+        ml_home = o.get("ML Home")
+
+        note = date_note.get(s["RawDate"], "")
+        if spread is None and total is None and ml_away is None and ml_home is None:
+            note = note or DEFAULT_NOTE
+
+        columns["Date"].append(s["Date"])
+        columns["Time"].append(s["Time"])
+        columns["Away"].append(s["Away"])
+        columns["Home"].append(s["Home"])
+        columns["Spread (Home)"].append(spread)
+        columns["Total (O/U)"].append(total)
+        columns["ML Away"].append(ml_away)
+        columns["ML Home"].append(ml_home)
+        columns["Imp Away"].append(o.get("Imp Away"))
+        columns["Imp Home"].append(o.get("Imp Home"))
+        columns["Note"].append(note)
 
     # 4) convert the rows to a DataFrame and then to HTML
     # Utilized ChatGPT to generate the understand how to implement this feature and utilized a similar approach throughout the code.
-    df = pd.DataFrame(out_rows).sort_values(["Date", "Time"], na_position="last").reset_index(drop=True)
+    df = pd.DataFrame(columns).sort_values(["Date", "Time"], na_position="last").reset_index(drop=True)
     table_html = df.to_html(index=False)
 
     # 5) check for any missing dates where betting odds are not posted yet
@@ -1,10 +1,25 @@
 # utils/api.py
+import json
 import os
 import re
+import sqlite3
+import tempfile
+import time
 import requests
+# orjson parses the large schedule/projection payloads a few times faster
+# than the stdlib; fall back to json.loads when it is not installed.
+try:
+    from orjson import loads as _jloads
+except ImportError:
+    from json import loads as _jloads
+from requests_cache import CachedSession
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter, Retry
 from datetime import datetime
 from functools import lru_cache
+from itertools import product
 from typing import Dict, List, Tuple, Optional, Any
+from utils.ttl_cache import ttl_cache
 
 # API Configuration
 # Ensure you have the X_RAPIDAPI_KEY set in your environment or .env file
@@ -14,8 +29,32 @@ API_KEY = os.getenv("X_RAPIDAPI_KEY", "")
 HEADERS = {
     "x-rapidapi-host": "tank01-nfl-live-in-game-real-time-statistics-nfl.p.rapidapi.com",
     "x-rapidapi-key": API_KEY or "",
+    "Connection": "keep-alive",
 }
 
+# All API traffic goes through one pooled Session so concurrent calls reuse
+# TCP/TLS connections instead of paying the handshake on every request.
+# The pool is sized to match the thread fan-out in the services, and a small
+# retry with backoff smooths over transient RapidAPI hiccups.
+# The Session also caches responses at the HTTP layer: upstream ETag /
+# Cache-Control headers are honored where present, everything else expires
+# after 5 minutes, and stale entries are served for up to a day if the
+# upstream errors out.
+_SESSION = CachedSession(
+    os.path.join(tempfile.gettempdir(), "ffb_http_cache"),
+    backend="sqlite",
+    expire_after=300,
+    stale_if_error=86400,
+    cache_control=True,
+)
+_SESSION.headers.update(HEADERS)
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2,
+                      status_forcelist=(429, 500, 502, 503, 504)),
+))
+
 # Ensure API_KEY is set before making requests
 def _require_key() -> None:
     if not API_KEY:
@@ -23,94 +62,165 @@ def _require_key() -> None:
 
 # Get the current season year
 # This is used to determine the current NFL season based on the year.
+# The answer only changes once a year, so it is memoized per calendar date;
+# repeated calls on the hot routes reduce to a single cached lookup while
+# still rolling over correctly at midnight on New Year's Eve.
+@lru_cache(maxsize=1)
+def _season_for_date(d) -> str:
+    return str(d.year)
+
 def current_season() -> str:
-    return str(datetime.today().year)
+    return _season_for_date(datetime.today().date())
 
 def api_get(ep: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     _require_key()
-    r = requests.get(f"{BASE_URL}/{ep}", headers=HEADERS, params=params or {}, timeout=20)
+    # The session carries the API headers, so none are passed per call
+    r = _SESSION.get(f"{BASE_URL}/{ep}", params=params or {}, timeout=20)
     r.raise_for_status()
-    return r.json()
+    return _jloads(r.content)
+
+# Shared executor for fanning out independent API calls.
+# Sized to match the Session connection pool above.
+_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+def api_get_many(calls: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Optional[Dict[str, Any]]]:
+    """Issue several independent API calls concurrently.
+
+    Takes a list of (endpoint, params) pairs and returns the responses in the
+    same order. A call that raises yields None in its slot, so callers can
+    fall through to the next candidate the same way they would with a serial
+    try/except loop. Because every call still goes through api_get, tests
+    that stub api_get are unaffected.
+    """
+    def _one(call):
+        ep, params = call
+        try:
+            return api_get(ep, params)
+        except Exception:
+            return None
+    return list(_EXECUTOR.map(_one, calls))
 
 # Canonical team abbreviations and aliases
 # This dictionary maps common team abbreviations to their canonical forms.
 # It helps in normalizing team codes across different feeds and aliases.
 CANON = {"JAC":"JAX","WAS":"WSH","SFO":"SF","TAM":"TB","NOR":"NO","LA":"LAR","OAK":"LV","STL":"LAR","SD":"LAC"}
 
+# The alias domain is tiny (32 codes plus a handful of aliases), so the
+# remap itself is memoized and the common call is a single cache hit.
+@lru_cache(maxsize=256)
+def _canon_code(a: str) -> str:
+    return CANON.get(a, a)
+
 def canon_abv(abv: str, known: Optional[set] = None) -> str:
-    a = (abv or "").upper()
-    a = CANON.get(a, a)
+    a = _canon_code((abv or "").upper())
     if known and a not in known:
-        return CANON.get(a, a)
+        return _canon_code(a)
     return a
 
+# Reverse-alias index built once at import time.
+# expand_aliases used to scan all of CANON per call — and it runs for both
+# teams of every game in the schedule loop — so the full alias group for
+# each code is precomputed and the lookup is a single dict hit.
+_ALIASES: Dict[str, frozenset] = {}
+for _k, _v in CANON.items():
+    _ALIASES.setdefault(_v, {_v}).add(_k)
+    _ALIASES.setdefault(_k, {_k}).add(_v)
+_ALIASES = {k: frozenset(v) for k, v in _ALIASES.items()}
+
 # Expand team abbreviations to include aliases
-def expand_aliases(abv: str) -> set:
+def expand_aliases(abv: str) -> frozenset:
     a = (abv or "").upper()
-    outs = {a}
-    for k, v in CANON.items():
-        if v == a:
-            outs.add(k)
-        if k == a:
-            outs.add(v)
-    return outs
-
-# Normalize a team abbreviation by removing common prefixes and suffixes
+    return _ALIASES.get(a, frozenset({a}))
+
+# Unwrap an API payload into a plain list of records.
+# This runs on every payload, so dispatch uses exact-type checks instead of
+# isinstance chains and drops the old raw.get(key, []) fallback — body is
+# already raw itself whenever "body" is absent, so that branch never found
+# anything the dict path had not.
 def normalize_list(raw, key: str | None = None):
-    if isinstance(raw, dict):
+    if type(raw) is list:
+        items = raw
+    elif type(raw) is dict:
         body = raw.get("body", raw)
-        if key and isinstance(body, dict):
+        if key and type(body) is dict:
             items = body.get(key, [])
-        elif isinstance(body, list):
+        elif type(body) is list:
             items = body
         else:
-            items = raw.get(key, []) if key else []
-    elif isinstance(raw, list):
-        items = raw
+            items = []
     else:
-        items = []
+        return []
 
     # If items are strings, convert them to a dict with teamAbv and teamName
-    if items and isinstance(items[0], str):
+    if items and type(items[0]) is str:
         return [{"teamAbv": s, "teamName": s} for s in items]
     return items
 
-# Normalize a team abbreviation by removing common prefixes and suffixes
+# Coerce a stat value to float without raising.
+# This helper runs several times per stat object in _parse_points, so the
+# common numeric cases dispatch on exact type and never touch the exception
+# machinery; the try/except only guards the string path, where it can still
+# fail for things like "N/A".
 def _to_float(x) -> Optional[float]:
-    try:
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
         return float(x)
-    except Exception:
-        return None
+    if t is str:
+        try:
+            return float(x)
+        except ValueError:
+            return None
+    return None
+
+# The candidate key orders below never change for a given scoring mode, so
+# they are built once as tuples instead of fresh lists on every call — this
+# runs once per player per projection pass.
+_FPD_KEYS_CACHE: Dict[str, tuple] = {}
+
+def _fpd_keys(s: str) -> tuple:
+    return _FPD_KEYS_CACHE.setdefault(s, (s, "PPR", "standard", "halfPPR", "HalfPPR", "Default"))
+
+_FP_KEYS = ("fantasyPointsPPR", "fantasyPointsHalfPPR", "fantasyPointsStandard")
 
 def _parse_points(obj: Dict[str, Any], scoring: str) -> Optional[float]:
     if not isinstance(obj, dict):
         return None
 
     # Check for fantasyPoints field
-    if "fantasyPoints" in obj:
-        v = _to_float(obj.get("fantasyPoints"))
-        if v is not None:
-            return v
+    # Each candidate field is read with a single .get; the earlier
+    # "key in dict" membership test doubled every lookup on this hot path.
+    v = obj.get("fantasyPoints")
+    if v is not None:
+        fv = _to_float(v)
+        if fv is not None:
+            return fv
 
     # Check for fantasyPointsDefault field
-    # This field can be a dict with multiple scoring formats
+    # This field can be a dict with multiple scoring formats; keys are tried
+    # in priority order so the configured scoring mode still wins when
+    # several formats are present.
     fpd = obj.get("fantasyPointsDefault")
-    if isinstance(fpd, dict):
-        for key in [scoring, "PPR", "standard", "halfPPR", "HalfPPR", "Default"]:
-            if key in fpd:
-                v = _to_float(fpd.get(key))
-                if v is not None:
-                    return v
-    else:
-        v = _to_float(fpd)
-        if v is not None:
-            return v
+    if type(fpd) is dict:
+        for key in _fpd_keys(scoring):
+            v = fpd.get(key)
+            if v is not None:
+                fv = _to_float(v)
+                if fv is not None:
+                    return fv
+    elif fpd is not None:
+        fv = _to_float(fpd)
+        if fv is not None:
+            return fv
 
     # Check for fantasyPointsPPR, fantasyPointsHalfPPR, fantasyPointsStandard
-    for k in ["fantasyPointsPPR", "fantasyPointsHalfPPR", "fantasyPointsStandard"]:
-        v = _to_float(obj.get(k))
+    for k in _FP_KEYS:
+        v = obj.get(k)
         if v is not None:
-            return v
+            fv = _to_float(v)
+            if fv is not None:
+                return fv
     return None
 
 # Generate slug candidates for a player's name
@@ -119,8 +229,17 @@ def _parse_points(obj: Dict[str, Any], scoring: str) -> Optional[float]:
 # Utilized ChatGPT to understand how to generate slugs effectively.
 _SUFFIXES = {"jr","sr","ii","iii","iv","v","vi"}
 
+# Common punctuation is dropped with a single C-level translate pass; the
+# precompiled regex only runs for the rare name with characters outside that
+# table. This runs once per player, but a full roster is hundreds of calls.
+_PUNCT_TBL = str.maketrans({c: None for c in ".,'\"()!?"})
+_SLUG_RE = re.compile(r"[^\w\s-]")
+
 def _slug_candidates(name: str) -> List[str]:
-    base = re.sub(r"[^\w\s-]", "", (name or "")).strip().lower()
+    base = (name or "").translate(_PUNCT_TBL)
+    if not base.isascii() or _SLUG_RE.search(base):
+        base = _SLUG_RE.sub("", base)
+    base = base.strip().lower()
     toks = [t for t in base.split() if t]
     slugs = []
     if toks:
@@ -135,19 +254,88 @@ def _slug_candidates(name: str) -> List[str]:
             seen.add(s); out.append(s)
     return out
 
+# Disk layer under the in-memory profile LRU.
+# The LRU is wiped on every process restart, so each fresh worker used to
+# re-hit the player API for the same stable roster. Profiles are persisted
+# to a small sqlite table (shared with the projections service cache file)
+# keyed by the primary slug, with a 24h TTL to keep injury info reasonably
+# fresh. Disk errors are swallowed — the cache degrades to memory-only.
+# FFB_CACHE_DB overrides the location so tests (and parallel deployments)
+# can use a private file instead of the shared one in /tmp.
+_PROFILE_DB_PATH = os.getenv("FFB_CACHE_DB") or os.path.join(tempfile.gettempdir(), "ffb_profile_cache.sqlite")
+_PROFILE_DISK_TTL = 24 * 3600
+
+def _profile_db():
+    conn = sqlite3.connect(_PROFILE_DB_PATH, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS profiles (name TEXT PRIMARY KEY, json TEXT, created_at INT)"
+    )
+    return conn
+
+def _profile_disk_get(key: str):
+    """Return (profile, age_seconds) for a stored profile, or None."""
+    try:
+        with _profile_db() as conn:
+            row = conn.execute(
+                "SELECT json, created_at FROM profiles WHERE name = ?", (key,)
+            ).fetchone()
+        if row:
+            return json.loads(row[0]), time.time() - row[1]
+    except Exception:
+        pass
+    return None
+
+def _profile_disk_put(key: str, prof: Dict[str, Any]) -> None:
+    try:
+        with _profile_db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO profiles (name, json, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(prof), int(time.time())),
+            )
+    except Exception:
+        pass
+
 # Considering long loading times, we utilized ChatGPT to understand how to implement this feature to improve user experience.
+# All slug candidates are fired concurrently instead of paying a full
+# round-trip per miss; answers are read back in slug-priority order so the
+# best match still wins when several slugs resolve. The LRU on top means
+# the fan-out happens once per name per process.
 @lru_cache(maxsize=2048)
 def fetch_profile(player_name: str) -> Dict[str, Any]:
     """Best-effort player profile lookup using multiple slugs."""
-    for slug in _slug_candidates(player_name):
+    slugs = _slug_candidates(player_name)
+    key = slugs[0] if slugs else None
+    stored = _profile_disk_get(key) if key else None
+    if stored and stored[1] < _PROFILE_DISK_TTL:
+        return stored[0]
+
+    futures = [
+        _EXECUTOR.submit(lambda s=s: api_get("getNFLPlayerInfo", {"playerName": s, "getStats": "false"}))
+        for s in slugs
+    ]
+    for fut in futures:
         try:
-            raw = api_get("getNFLPlayerInfo", {"playerName": slug, "getStats": "false"})
-            body = raw.get("body", [])
-            if isinstance(body, list) and body:
-                return body[0]
+            body = fut.result().get("body", [])
         except Exception:
             continue
-    return {}
+        if isinstance(body, list) and body:
+            if key:
+                _profile_disk_put(key, body[0])
+            return body[0]
+    # Upstream failed or came back empty: an expired disk copy beats nothing
+    return stored[0] if stored else {}
+
+# Bulk variant for callers holding a whole roster of names.
+# The outer fan-out runs on its own pool, NOT on _EXECUTOR: fetch_profile
+# submits its slug lookups to _EXECUTOR and blocks on the results, so with
+# enough uncached names the shared pool would fill with outer calls all
+# waiting on inner futures that can never be scheduled — a deadlock, not
+# just contention. Two pools keep producers and consumers separate; the
+# Session pool above is sized to absorb the combined fan-out.
+_BULK_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+def fetch_profiles_bulk(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    return dict(zip(names, _BULK_EXECUTOR.map(fetch_profile, names)))
 
 # Extracts injury information from a player's profile
 def injury_from_profile(bio: Dict[str, Any]) -> str:
@@ -162,45 +350,135 @@ def weekly_injury_text(_: Dict[str, Any]) -> str:
     return "(Weekly Information Not Available)"
 
 # Fetches weekly opponent and location information for a given season and week
+# The three candidate endpoints are launched concurrently and their results
+# inspected in priority order — the common case returns as soon as the first
+# endpoint yields games, without waiting on the slower fallbacks.
+# Finalized schedules are effectively static, so results are memoized for
+# hours (and served stale for a day); the public wrapper just freezes the
+# known-abbreviations set so it can be part of the cache key.
 def get_week_opp_and_loc(season: str, week: int, known_abvs: set) -> Tuple[Dict[str,str], Dict[str,str]]:
+    return _week_opp_and_loc_cached(season, week, frozenset(known_abvs or ()))
+
+# Pre-baked key precedence for the per-game loop below; the old inline
+# `g.get("home") or g.get("homeTeam") or ...` chain re-resolved four method
+# lookups per game per attempt.
+_HOME_KEYS = ("home", "homeTeam", "homeTeamAbv", "homeTeamAbbr")
+_AWAY_KEYS = ("away", "awayTeam", "awayTeamAbv", "awayTeamAbbr")
+
+def _first_key(d: Dict[str, Any], keys: tuple):
+    for k in keys:
+        v = d.get(k)
+        if v:
+            return v
+    return None
+
+def _maps_from_resp(data: Any, known_abvs: frozenset) -> Optional[Tuple[Dict[str,str], Dict[str,str]]]:
+    """Parse one schedule response into (opp_map, loc_map), or None if empty."""
+    body = data.get("body", {}) if isinstance(data, dict) else {}
+    games = None
+    if isinstance(body, dict):
+        if isinstance(body.get("games"), list):
+            games = body["games"]
+        elif isinstance(body.get("weeklySchedule"), list):
+            games = body["weeklySchedule"]
+    elif isinstance(body, list):
+        games = body
+
+    if not games:
+        return None
+
+    opp_map, loc_map = {}, {}
+    # Once every known team is mapped there is nothing left to learn, so the
+    # loop bails out early instead of walking duplicate or extra records
+    # (playoff payloads in particular bundle metadata past the real games).
+    # The cheap length check gates the exact subset test.
+    target = len(known_abvs)
+    # Local bindings keep the per-game loop off the global lookup path
+    _canon, _expand = canon_abv, expand_aliases
+    for g in games:
+        if target and len(opp_map) >= target and known_abvs <= opp_map.keys():
+            break
+        ha = _first_key(g, _HOME_KEYS)
+        aa = _first_key(g, _AWAY_KEYS)
+        if not ha or not aa:
+            continue
+        home = _canon(str(ha), known_abvs)
+        away = _canon(str(aa), known_abvs)
+        # itertools.product walks the precomputed alias groups in C rather
+        # than a nested Python loop re-calling expand_aliases per pairing
+        for h_al, a_al in product(_expand(home), _expand(away)):
+            opp_map[h_al] = a_al; loc_map[h_al] = "H"
+            opp_map[a_al] = h_al; loc_map[a_al] = "A"
+    return (opp_map, loc_map) if opp_map else None
+
+# Finalized weekly schedules survive process restarts on disk (same sqlite
+# file as the profile cache) so a fresh worker skips the endpoint probe
+# entirely. The winning endpoint per (season, week) is also remembered so a
+# cold-cache call hits that one directly instead of probing all three.
+_SCHEDULE_DISK_TTL = 6 * 3600
+_WEEK_EP: Dict[Tuple[str, int], str] = {}
+
+def _schedule_disk_get(season: str, week: int):
+    try:
+        with _profile_db() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS schedules (key TEXT PRIMARY KEY, json TEXT, created_at INT)"
+            )
+            row = conn.execute(
+                "SELECT json, created_at FROM schedules WHERE key = ?", (f"{season}:{week}",)
+            ).fetchone()
+        if row and time.time() - row[1] < _SCHEDULE_DISK_TTL:
+            opp_map, loc_map = json.loads(row[0])
+            return opp_map, loc_map
+    except Exception:
+        pass
+    return None
+
+def _schedule_disk_put(season: str, week: int, maps: Tuple[Dict[str,str], Dict[str,str]]) -> None:
+    try:
+        with _profile_db() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS schedules (key TEXT PRIMARY KEY, json TEXT, created_at INT)"
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO schedules (key, json, created_at) VALUES (?, ?, ?)",
+                (f"{season}:{week}", json.dumps(maps), int(time.time())),
+            )
+    except Exception:
+        pass
+
+@ttl_cache(6 * 3600, 24 * 3600)
+def _week_opp_and_loc_cached(season: str, week: int, known_abvs: frozenset) -> Tuple[Dict[str,str], Dict[str,str]]:
+    disk = _schedule_disk_get(season, week)
+    if disk is not None:
+        return disk
+
+    params = {"season": season, "week": week}
     attempts = [
-        ("getNFLWeeklySchedule", {"season": season, "week": week}),
-        ("getNFLGamesForWeek", {"season": season, "week": week}),
-        ("getNFLScoreboard", {"season": season, "week": week}),
+        ("getNFLWeeklySchedule", params),
+        ("getNFLGamesForWeek", params),
+        ("getNFLScoreboard", params),
     ]
-    opp_map, loc_map = {}, {}
 
-    for ep, params in attempts:
+    # A known-good endpoint for this week is queried alone; only when it
+    # fails (or nothing is known yet) do all three probes go out.
+    winner = _WEEK_EP.get((season, week))
+    if winner:
         try:
-            data = api_get(ep, params)
+            maps = _maps_from_resp(api_get(winner, params), known_abvs)
         except Exception:
-            continue
+            maps = None
+        if maps:
+            _schedule_disk_put(season, week, maps)
+            return maps
 
-        body = data.get("body", {})
-        games = None
-        if isinstance(body, dict):
-            if isinstance(body.get("games"), list):
-                games = body["games"]
-            elif isinstance(body.get("weeklySchedule"), list):
-                games = body["weeklySchedule"]
-        elif isinstance(body, list):
-            games = body
-
-        if not games:
+    for (ep, _), data in zip(attempts, api_get_many(attempts)):
+        if data is None:
             continue
+        maps = _maps_from_resp(data, known_abvs)
+        if maps:
+            _WEEK_EP[(season, week)] = ep
+            _schedule_disk_put(season, week, maps)
+            return maps
 
-        for g in games:
-            ha = g.get("home") or g.get("homeTeam") or g.get("homeTeamAbv") or g.get("homeTeamAbbr")
-            aa = g.get("away") or g.get("awayTeam") or g.get("awayTeamAbv") or g.get("awayTeamAbbr")
-            if not ha or not aa:
-                continue
-            home = canon_abv(str(ha), known_abvs)
-            away = canon_abv(str(aa), known_abvs)
-            for h_al in expand_aliases(home):
-                for a_al in expand_aliases(away):
-                    opp_map[h_al] = a_al; loc_map[h_al] = "H"
-                    opp_map[a_al] = h_al; loc_map[a_al] = "A"
-        if opp_map:
-            break
-
-    return opp_map, loc_map
+    return {}, {}
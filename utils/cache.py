@@ -0,0 +1,12 @@
+# utils/cache.py
+from flask_caching import Cache
+
+# Shared Flask-Caching instance for the whole app.
+# The routes decorate their view functions with @cache.cached so that a page
+# is only rebuilt (API fetches + HTML tables) once per timeout window instead
+# of on every request. SimpleCache keeps everything in-process, which is all
+# we need for a single-worker deployment.
+cache = Cache(config={
+    "CACHE_TYPE": "SimpleCache",
+    "CACHE_DEFAULT_TIMEOUT": 180,
+})
@@ -0,0 +1,67 @@
+# utils/ttl_cache.py
+import threading
+import time
+from functools import wraps
+
+# Small TTL cache decorator with stale-while-revalidate semantics.
+# Each entry stores (value, fresh_until, stale_until):
+#   - fresh hit: return the value, no work done
+#   - stale hit (past ttl, within stale window): return the stale value
+#     immediately and refresh it on a background daemon thread
+#   - miss or fully expired: compute synchronously; if the compute raises
+#     and a stale value exists, fall back to it instead of failing the page
+# This suits the slow external API calls in the services: schedules barely
+# change within a day and odds only drift minute to minute.
+def ttl_cache(ttl_seconds: float, stale_seconds: float | None = None):
+    stale_seconds = stale_seconds if stale_seconds is not None else ttl_seconds
+
+    def decorator(fn):
+        entries = {}
+        refreshing = set()
+        lock = threading.Lock()
+
+        def _store(key, args, kwargs):
+            value = fn(*args, **kwargs)
+            now = time.time()
+            entries[key] = (value, now + ttl_seconds, now + stale_seconds)
+            return value
+
+        def _refresh(key, args, kwargs):
+            try:
+                _store(key, args, kwargs)
+            except Exception:
+                pass  # keep serving the stale entry
+            finally:
+                with lock:
+                    refreshing.discard(key)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.time()
+            entry = entries.get(key)
+
+            if entry is not None:
+                value, fresh_until, stale_until = entry
+                if now < fresh_until:
+                    return value
+                if now < stale_until:
+                    with lock:
+                        if key not in refreshing:
+                            refreshing.add(key)
+                            threading.Thread(
+                                target=_refresh, args=(key, args, kwargs), daemon=True
+                            ).start()
+                    return value
+
+            try:
+                return _store(key, args, kwargs)
+            except Exception:
+                if entry is not None:
+                    return entry[0]
+                raise
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+
+    return decorator